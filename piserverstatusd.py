@@ -7,19 +7,30 @@ Display raspberry pi statistics (IP addresses, CPU load), weather, time, on the
 """
 
 import argparse
+from bisect import bisect_left
 import configparser
+from functools import lru_cache, partial
 from datetime import datetime
+import errno
 import fcntl
 import logging
 import logging.handlers
 import math
 import os
+import select
+import sched
+import signal
 import socket
-import struct
+import threading
 import time
+from types import MappingProxyType, SimpleNamespace
 
+from diskcache import Cache
 import psutil
 import pyowm
+from pyowm.exceptions.api_call_error import APICallError
+import requests
+import requests_cache
 import scrollphat
 
 from pydaemon import Daemon
@@ -27,8 +38,9 @@ from pydaemon import Daemon
 #
 # List of possible weather phenomena codes returned by OpenWeatherMap
 # https://openweathermap.org/weather-conditions
+# (read-only, as WXTABLE below is derived from it)
 #
-wxcodes = {
+wxcodes = MappingProxyType({
     200: 'TS -RA',  # thunderstorm, light rain
     201: 'TSRA',    # thunderstorm, rain
     202: 'TS +RA',  # thunderstorm, heavy rain
@@ -88,16 +100,70 @@ wxcodes = {
     802: 'SCT',     # 3-4 oktas of cloud
     803: 'BKN',     # 5-6 oktas of cloud
     804: 'OVC'      # 7-8 oktas of cloud
-}
+})
+
+#
+# The same weather codes as a flat table indexed by the code itself, with None for codes not in use
+#
+WXTABLE = tuple(wxcodes.get(code) for code in range(max(wxcodes) + 1))
+
+LN10 = math.log(10.0)
+KT_PER_MPS = 1852.0 / 3600.0
+
+#
+# Scroll pHAT columns for the bar graph levels, from an empty column to all 5 pixels lit
+#
+GRAPH_BARS = bytes((0, 16, 24, 28, 30, 31))
+
+#
+# Cloud cover percentage thresholds (upper bounds, inclusive), the matching METAR codes,
+# and the resulting METAR code for every percentage 0...100
+#
+CLOUD_THRESHOLDS = (0, 25, 50, 75)
+CLOUD_CODES = ('', 'FEW', 'SCT', 'BKN', 'OVC')
+CLOUD_TABLE = tuple(CLOUD_CODES[bisect_left(CLOUD_THRESHOLDS, percentage)] for percentage in range(101))
+
+#
+# rtnetlink multicast group used to watch for changes of the interface IPv4 addresses
+#
+RTMGRP_IPV4_IFADDR = 0x10
+
+#
+# Translation table flipping the 5 pixels of a Scroll pHAT column upside down, used when the display is rotated
+#
+ROTATE5BITS = bytes(int('{:05b}'.format(x & 0x1f)[::-1], 2) for x in range(256))
 
 
 class StatusDaemon(Daemon):
 
     DEFAULT_BRIGHTNESS = 10
     DEFAULT_WX_INTERVAL = 300
+    MIN_WX_INTERVAL = 120
+    MAX_WX_INTERVAL = 1800
+    DEFAULT_WX_CACHE_DIR = '/var/cache/piserverstatusd'
+    DEFAULT_WX_CACHE_TTL = 900
+    DEFAULT_WX_TTL_MAIN = 900
+    DEFAULT_WX_TTL_PRESSURE = 1800
+    WX_RETRIES = 3
+    WX_RETRY_BACKOFF = 0.3
+    WX_RETRY_INTERVAL = 60
+    DEFAULT_IP_INTERVAL = 30
+    WATCHED_IP_INTERVAL = 300
     DEFAULT_DISPLAY_COUNT = 1
     DEFAULT_INTERVAL = 0.2
 
+    DEFAULT_TIME_PERIOD = 0
+    DEFAULT_NETWORK_PERIOD = 30
+    DEFAULT_CPULOAD_PERIOD = 5
+    DEFAULT_CPUGRAPH_PERIOD = 0
+    IDLE_LOADAVG = 0.05
+
+    SCROLLPHAT_WIDTH = 11
+    SCROLLPHAT_UPDATE_REGISTER = 0x01
+    SCROLLPHAT_I2C_DEVICE = '/dev/i2c-{}'
+    SCROLLPHAT_MAX_ERRORS = 10
+    I2C_SLAVE = 0x0703
+
     #
     # Daemon Initialisation methods
     #
@@ -108,10 +174,36 @@ class StatusDaemon(Daemon):
         """
 
         self.scrollphat_brightness = self.DEFAULT_BRIGHTNESS
+        self.flags = SimpleNamespace(time=False, network=False, cpuload=False, cpugraph=False, weather=False,
+                                     flip=False)
+        self.i2c_fd = None
+        self.i2c_errors = 0
         self.owm = None
         self.wx = None
-        self.wx_acquisition_ts = 0
+        self.wx_acquisition_ts = -math.inf
         self.wx_refresh_interval = self.DEFAULT_WX_INTERVAL
+        self.wx_reference_time = None
+        self.wx_lock = threading.Lock()
+        self.wx_thread = None
+        self.wx_stop = threading.Event()
+        self.wx_cache = None
+        self.metar = None
+        self.metar_key = None
+        self.wx_location = None
+        self.wx_location_key = None
+        self.ip_addresses = dict()
+        self.ip_acquisition_ts = -math.inf
+        self.ip_refresh_interval = self.DEFAULT_IP_INTERVAL
+        self.ip_watcher = None
+        self.cpu_idle = 0
+        self.cpu_total = 0
+
+        self.time_second = None
+        self.time_string = ''
+        self.scheduler = sched.scheduler(time.monotonic, self.scheduler_sleep)
+        self.config_reloaded = False
+        self.wakeup_fd = None
+        self.stopping = False
 
         super().__init__(pidfile, config_file, stdin, stdout, stderr, daemon_name='piserverstatusd')
 
@@ -123,6 +215,7 @@ class StatusDaemon(Daemon):
 
         if not self.config_file:
             self.logger.info('No configuration file specified. Running with defaults.')
+            self.load_runtime_config()
             return
 
         if not os.path.exists(self.config_file):
@@ -137,12 +230,67 @@ class StatusDaemon(Daemon):
         self.scrollphat_brightness = self.configuration.getint('scrollphat',
                                                                'brightness',
                                                                fallback=self.DEFAULT_BRIGHTNESS)
+        self.load_runtime_config()
 
-        owm_api_key = self.configuration.get('weather', 'openweathermap_api_key', fallback=None)
-        if owm_api_key:
+        # pyowm loads its city index when constructed, so only set it up if the weather is going to be displayed
+        self.owm = None
+        owm_api_key = self.configuration.get('weather', 'openweathermap_api_key',
+                                             fallback=os.environ.get('OWM_API_KEY'))
+        if self.flags.weather and owm_api_key:
             owm_api_key = owm_api_key.strip("'")
             self.owm = pyowm.OWM(API_key=owm_api_key)
 
+    def load_runtime_config(self):
+        """
+        Read the display options from the configuration into plain attributes, so that the run loop
+        does not have to go through ConfigParser on every pass
+        """
+
+        config = self.configuration
+        self.flags = SimpleNamespace(
+            time=config.getboolean('scrollphat', 'time_display', fallback=False),
+            network=config.getboolean('scrollphat', 'network_display', fallback=False),
+            cpuload=config.getboolean('scrollphat', 'cpuload_display', fallback=False),
+            cpugraph=config.getboolean('scrollphat', 'cpugraph_display', fallback=False),
+            weather=config.getboolean('scrollphat', 'weather_display', fallback=False),
+            flip=config.getboolean('scrollphat', 'flip', fallback=False)
+        )
+
+        self.cfg_time_interval = config.getfloat('scrollphat', 'time_interval', fallback=self.DEFAULT_INTERVAL)
+        self.cfg_time_display_count = config.getint('scrollphat', 'time_display_count',
+                                                    fallback=self.DEFAULT_DISPLAY_COUNT)
+        self.cfg_time_period = config.getfloat('scrollphat', 'time_period', fallback=self.DEFAULT_TIME_PERIOD)
+
+        self.cfg_network_interval = config.getfloat('scrollphat', 'network_interval', fallback=self.DEFAULT_INTERVAL)
+        self.cfg_network_display_count = config.getint('scrollphat', 'network_display_count',
+                                                       fallback=self.DEFAULT_DISPLAY_COUNT)
+        self.cfg_network_period = config.getfloat('scrollphat', 'network_period',
+                                                  fallback=self.DEFAULT_NETWORK_PERIOD)
+
+        self.cfg_cpuload_interval = config.getfloat('scrollphat', 'cpuload_interval', fallback=self.DEFAULT_INTERVAL)
+        self.cfg_cpuload_display_count = config.getint('scrollphat', 'cpuload_display_count',
+                                                       fallback=self.DEFAULT_DISPLAY_COUNT)
+        self.cfg_cpuload_period = config.getfloat('scrollphat', 'cpuload_period',
+                                                  fallback=self.DEFAULT_CPULOAD_PERIOD)
+
+        self.cfg_cpugraph_duration = config.getint('scrollphat', 'cpugraph_duration', fallback=15)
+        self.cfg_cpugraph_interval = config.getfloat('scrollphat', 'cpugraph_interval', fallback=self.DEFAULT_INTERVAL)
+        self.cfg_cpugraph_period = config.getfloat('scrollphat', 'cpugraph_period',
+                                                   fallback=self.DEFAULT_CPUGRAPH_PERIOD)
+
+        self.cfg_latitude = config.getfloat('weather', 'latitude', fallback=None)
+        self.cfg_longitude = config.getfloat('weather', 'longitude', fallback=None)
+        self.cfg_wx_cache_dir = config.get('weather', 'cache_dir', fallback=self.DEFAULT_WX_CACHE_DIR)
+        self.cfg_wx_cache_ttl = config.getint('weather', 'cache_ttl', fallback=self.DEFAULT_WX_CACHE_TTL)
+        self.cfg_wx_ttl_main = config.getint('weather', 'ttl_main', fallback=self.DEFAULT_WX_TTL_MAIN)
+        self.cfg_wx_ttl_pressure = config.getint('weather', 'ttl_pressure', fallback=self.DEFAULT_WX_TTL_PRESSURE)
+
+        self.cfg_weather_interval = config.getfloat('scrollphat', 'weather_interval', fallback=self.DEFAULT_INTERVAL)
+        self.cfg_weather_display_count = config.getint('scrollphat', 'weather_display_count',
+                                                       fallback=self.DEFAULT_DISPLAY_COUNT)
+        # without an explicit period, the weather is displayed whenever a new observation may be available
+        self.cfg_weather_period = config.getfloat('scrollphat', 'weather_period', fallback=None)
+
     def reconfigure_logging(self):
         """
         The Daemon class initially configures its own logger, however often this configuration can be improved upon
@@ -182,10 +330,22 @@ class StatusDaemon(Daemon):
         scrollphat.clear()
         super().stop(silent)
 
+    def sighup_handler(self, signo, frame):
+        """
+        Re-read the configuration file when the daemon receives SIGHUP
+        """
+        self.logger.info('Reloading configuration')
+        self.configure()
+        self.config_reloaded = True
+        scrollphat.set_brightness(self.scrollphat_brightness)
+        scrollphat.set_rotate(self.flags.flip)
+
     def sigterm_handler(self, signo, frame):
         """
         Override the Daemon.sigterm_handler() to turn off the scrollphat when the daemon process is terminated
         """
+        self.stopping = True
+        self.wx_stop.set()
         scrollphat.clear()
         super().sigterm_handler(signo, frame)
 
@@ -193,31 +353,103 @@ class StatusDaemon(Daemon):
     # Helper methods for information display
     #
 
-    def get_ip(self, ifname):
+    def get_ips(self):
+        """
+        Get the IPv4 addresses configured on all interfaces
+        The addresses are cached and only refreshed from psutil every self.ip_refresh_interval seconds,
+        as they normally only change on DHCP lease renewal
+
+        :return dict: IP addresses keyed by interface name; None for interfaces with no IPv4 address
+        """
+
+        now = time.monotonic()
+        if now - self.ip_acquisition_ts > self.ip_refresh_interval:
+            self.ip_addresses = {
+                ifname: next((addr.address for addr in addrs if addr.family == socket.AF_INET), None)
+                for ifname, addrs in psutil.net_if_addrs().items()
+            }
+            self.ip_acquisition_ts = now
+            self.logger.debug('IP addresses: {}'.format(self.ip_addresses))
+        return self.ip_addresses
+
+    def watch_ip_addresses(self):
         """
-        Get the IPv4 address configured on an interface
-        :param str ifname: interface name
-        :return str: IP address configured on an interface
+        Start a background thread listening for IPv4 address changes on the rtnetlink socket,
+        which invalidates the IP address cache whenever an address is added or removed.
+        As the cache no longer has to catch changes by itself, it is refreshed much less often.
+        Nothing is done if the watcher is already running
         """
 
-        ifname = ifname[:15].encode('utf-8')
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        ipaddr = socket.inet_ntoa(fcntl.ioctl(s.fileno(), 0x8915, struct.pack('256s', ifname))[20:24])
-        self.logger.debug('IP address: {}:{}'.format(str(ifname), ipaddr))
-        return ipaddr
+        if self.ip_watcher is not None:
+            return
+
+        try:
+            nl_socket = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            nl_socket.bind((0, RTMGRP_IPV4_IFADDR))
+        except (AttributeError, OSError) as e:
+            self.logger.warning('Cannot watch for IP address changes: {}'.format(str(e)))
+            return
+
+        def watch():
+            try:
+                with nl_socket:
+                    while True:
+                        try:
+                            nl_socket.recv(65536)
+                            self.logger.debug('IP addresses changed')
+                        except OSError as e:
+                            # the receive buffer overflowed and some events were lost: refresh the addresses anyway
+                            if e.errno != errno.ENOBUFS:
+                                raise
+                            self.logger.debug('IP address events lost, refreshing the addresses')
+                        self.ip_acquisition_ts = -math.inf
+            except Exception as e:
+                self.logger.warning('Stopped watching for IP address changes: {}: {}'.format(type(e).__name__,
+                                                                                           str(e)))
+                self.ip_refresh_interval = self.DEFAULT_IP_INTERVAL
+                self.ip_acquisition_ts = -math.inf
+                self.ip_watcher = None
+
+        self.ip_watcher = threading.Thread(target=watch, name='ip-watcher', daemon=True)
+        self.ip_watcher.start()
+        self.ip_refresh_interval = self.WATCHED_IP_INTERVAL
+
+    def cpu_percent(self):
+        """
+        Get the CPU usage since the previous call, read straight from the aggregate line of /proc/stat
+        (user, nice, system, idle, iowait, irq, softirq, steal), which is much cheaper than psutil.cpu_percent()
+        :return float: CPU usage as percentage
+        """
+
+        with open('/proc/stat', 'rb') as f:
+            times = [int(t) for t in f.readline().split()[1:9]]
+
+        idle = times[3] + times[4]
+        total = sum(times)
+        idle_delta = idle - self.cpu_idle
+        total_delta = total - self.cpu_total
+        self.cpu_idle = idle
+        self.cpu_total = total
+
+        if total_delta <= 0:
+            return 0.0
+        return 100.0 * (1.0 - idle_delta / total_delta)
 
     @staticmethod
     def get_ipv6(ifname):
         raise NotImplemented
 
-    @staticmethod
-    def get_time():
+    def get_time(self):
         """
-        Return current time in the hh:mm:ss format
+        Return current time in the hh:mm:ss format. The string is only formatted again once the second changes
         :return str: current time as hh:mm:ss
         """
-        now = datetime.now()
-        return now.strftime('%H:%M:%S')
+
+        now = int(time.time())
+        if now != self.time_second:
+            self.time_second = now
+            self.time_string = time.strftime('%H:%M:%S', time.localtime(now))
+        return self.time_string
 
     @staticmethod
     def mps_to_kt(mps):
@@ -226,7 +458,7 @@ class StatusDaemon(Daemon):
         :param float mps: speed in m/s
         :return int: knots
         """
-        return mps * 1852 / 3600
+        return mps * KT_PER_MPS
 
     @staticmethod
     def cloud(percentage):
@@ -236,18 +468,10 @@ class StatusDaemon(Daemon):
         :return str: METAR code for the cloud cover
         """
 
-        if percentage == 0:
-            return ''
-        elif 0 < percentage <= 25:
-            return 'FEW'
-        elif 25 < percentage <= 50:
-            return 'SCT'
-        elif 50 < percentage <= 75:
-            return 'BKN'
-        else:
-            return 'OVC'
+        return CLOUD_TABLE[percentage]
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def dewpoint(temperature, humidity):
         """
         Calculate dewpoint temperature using methodology from Vaisala document:
@@ -263,10 +487,11 @@ class StatusDaemon(Daemon):
         A = 6.116441
         m = 7.591386
         Tn = 240.7263
-        Pws = A * pow(10, (m * temperature / (temperature + Tn)))
+        # 10^x and log10(x) are evaluated as exp(x * ln10) and ln(x) / ln10
+        Pws = A * math.exp(LN10 * m * temperature / (temperature + Tn))
         Pw = Pws * humidity / 100.0
 
-        Td = Tn / (m / math.log10(Pw / A) - 1)
+        Td = Tn / (m * LN10 / math.log(Pw / A) - 1)
         return Td
 
     def metar_dewpoint(self, temperature, humidity):
@@ -306,15 +531,16 @@ class StatusDaemon(Daemon):
         wind_speed = wind.get('speed')
         wind_gust = wind.get('gust')
 
-        if not wind_dir or self.mps_to_kt(wind_speed) < 2:
-            wind_dir = '000'
-        else:
-            wind_dir = '{:03}'.format(wind_dir)
+        speed_kt = wind_speed * KT_PER_MPS if wind_speed else 0.0
+        gust_kt = wind_gust * KT_PER_MPS if wind_gust else 0.0
 
-        wind_speed = '{:02}'.format(int(self.mps_to_kt(wind_speed))) if wind_speed is not None else '00'
-        wind_gust = 'G{:02}'.format(int(self.mps_to_kt(wind_gust))) if wind_gust else ''
+        if not wind_dir or speed_kt < 2:
+            wind_dir = 0
 
-        wv = '{}{}{}KT'.format(wind_dir, wind_speed, wind_gust)
+        if gust_kt:
+            wv = '{:03}{:02}G{:02}KT'.format(wind_dir, int(speed_kt), int(gust_kt))
+        else:
+            wv = '{:03}{:02}KT'.format(wind_dir, int(speed_kt))
         self.logger.debug('Wind dir: {}'.format(wv))
         return wv
 
@@ -326,15 +552,17 @@ class StatusDaemon(Daemon):
         :return str: METAR code for pressure (QNH, QFE)
         """
 
-        result = ['', '']
-
-        if pressure['sea_level']:
-            result[0] = 'Q{:04}'.format(pressure['sea_level'])
+        sea_level = pressure['sea_level']
+        press = pressure['press']
 
-        if pressure['press']:
-            result[1] = 'QFE{:04}'.format(pressure['press'])
-
-        pressure = ' '.join(result).strip()
+        if sea_level and press:
+            pressure = 'Q{:04} QFE{:04}'.format(sea_level, press)
+        elif sea_level:
+            pressure = 'Q{:04}'.format(sea_level)
+        elif press:
+            pressure = 'QFE{:04}'.format(press)
+        else:
+            pressure = ''
         self.logger.debug('Pressure: {}'.format(pressure))
         return pressure
 
@@ -345,48 +573,216 @@ class StatusDaemon(Daemon):
         :return str: METAR codes for weather phenomena
         """
 
-        if type(wxcode) == list:
-            weather = list()
-            for item in wxcode:
-                if item != 800:
-                    weather.append(wxcodes[item])
-            weather = ' '.join(weather).strip()
-
+        if isinstance(wxcode, list):
+            codes = tuple(wxcode)
         else:
-            weather = ''
-            if wxcode < 800:
-                weather = wxcodes[wxcode]
+            codes = (wxcode,) if wxcode < 800 else ()
 
+        weather = self.weather_phenomena(codes)
         self.logger.debug('Weather phenomena: {}'.format(weather))
         return weather
 
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def weather_phenomena(codes):
+        """
+        Convert OpenWeatherMap weather codes into METAR weather, skipping the clear sky code.
+        The result is cached, as the same codes keep being reported from one observation to the next
+        :param tuple[int] codes: weather codes
+        :return str: METAR codes for weather phenomena
+        """
+
+        return ' '.join(WXTABLE[code] for code in codes if code != 800 and WXTABLE[code])
+
+    def start_weather_updates(self):
+        """
+        Start the background thread keeping the weather observation up to date, unless it is already running.
+        The HTTP cache is only set up along with it, so that nothing is patched while the weather is not displayed
+        """
+
+        if self.wx_thread is None:
+            self.install_http_cache()
+            self.wx_thread = threading.Thread(target=self.update_weather, name='weather', daemon=True)
+            self.wx_thread.start()
+
+    def update_weather(self):
+        """
+        Weather thread: refresh the weather observation on its own cadence, independently of the display,
+        so that a slow or failing OpenWeatherMap never stalls the Scroll pHAT
+        """
+
+        while not self.wx_stop.is_set():
+            # an unexpected error must not end the thread, or the weather would freeze for the life of the daemon
+            try:
+                if self.owm and self.cfg_latitude is not None and self.cfg_longitude is not None:
+                    self.get_weather(self.cfg_latitude, self.cfg_longitude)
+            except Exception as e:
+                self.logger.exception('Error updating weather: {}: {}'.format(type(e).__name__, str(e)))
+
+            # after a failed download, the refresh is already overdue: wait a while before retrying
+            delay = self.wx_acquisition_ts + self.wx_refresh_interval - time.monotonic()
+            self.wx_stop.wait(max(delay, self.WX_RETRY_INTERVAL))
+
+    def set_weather(self, wx, acquisition_ts, cache_key):
+        """
+        Replace the current weather observation. The location name only changes with the coordinates,
+        so it is only looked up again when the observation is for a different location
+        :param pyowm.weatherapi25.observation.Observation wx: weather observation
+        :param float acquisition_ts: time the observation was downloaded at (time.monotonic() timestamp)
+        :param str cache_key: key of the observation location in the weather cache
+        """
+
+        with self.wx_lock:
+            self.wx = wx
+            self.wx_acquisition_ts = acquisition_ts
+            if cache_key != self.wx_location_key:
+                self.wx_location = wx.get_location().get_name().upper()
+                self.wx_location_key = cache_key
+
     def get_weather(self, latitude, longitude):
         """
-        Get current weather for given coordinates from OpenWeatherMap
+        Get current weather for given coordinates from OpenWeatherMap, unless the current observation is still fresh
         The weather observation will be saved in self.wx property for access by other methods
 
         :param float latitude: GPS latitude
         :param float longitude: GPS longitude
         """
-        now = datetime.now()
-        if now.timestamp() - self.wx_acquisition_ts > self.wx_refresh_interval:
+
+        cache_key = '{:.3f},{:.3f}'.format(latitude, longitude)
+        if self.wx is None:
+            self.load_cached_weather(cache_key)
+
+        if time.monotonic() - self.wx_acquisition_ts > self.wx_refresh_interval:
             self.logger.info('Getting new weather for: {}, {}'.format(latitude, longitude))
-            observations = None
 
             try:
-                observations = self.owm.weather_around_coords(latitude, longitude, limit=1)
+                observations = self.fetch_weather(latitude, longitude)
             except Exception as e:
-                self.logger.exception('Error getting weather: {}: {}'.format(type(e).__name__,
-                                                                             str(e)))
+                self.logger.exception('Error getting weather: {}: {}'.format(type(e).__name__, str(e)))
             else:
                 if len(observations):
-                    self.wx = observations[0]
-                    self.wx_acquisition_ts = now.timestamp()
-                    self.logger.debug('Weather: {}'.format(self.wx.get_weather().to_JSON()))
+                    wx = observations[0]
+                    self.set_weather(wx, time.monotonic(), cache_key)
+                    w = wx.get_weather()
+                    self.logger.debug('Weather: {}'.format(w.to_JSON()))
+                    self.adapt_wx_refresh_interval(w.get_reference_time())
+
+                    if self.wx_cache is not None:
+                        try:
+                            self.wx_cache.set(cache_key, (time.time(), wx), expire=self.cfg_wx_cache_ttl)
+                        except Exception as e:
+                            self.logger.warning('Cannot store weather in the cache: {}: {}'.format(type(e).__name__,
+                                                                                                   str(e)))
+
+    def fetch_weather(self, latitude, longitude):
+        """
+        Download the current weather for given coordinates from OpenWeatherMap,
+        retrying with an exponential backoff when the API call fails
+        :param float latitude: GPS latitude
+        :param float longitude: GPS longitude
+        :return list: weather observations around the coordinates
+        """
+
+        for attempt in range(self.WX_RETRIES):
+            try:
+                return self.owm.weather_around_coords(latitude, longitude, limit=1)
+            except APICallError as e:
+                if attempt == self.WX_RETRIES - 1:
+                    raise
+                self.logger.warning('Error getting weather, retrying: {}: {}'.format(type(e).__name__, str(e)))
+                time.sleep(self.WX_RETRY_BACKOFF * 2 ** attempt)
+
+    def open_wx_cache(self):
+        """
+        Open the on-disk weather cache, which keeps the last observation across daemon restarts
+        :return diskcache.Cache or None: the weather cache; None if it cannot be opened
+        """
+
+        try:
+            return Cache(self.cfg_wx_cache_dir)
+        except Exception as e:
+            self.logger.warning('Cannot open the weather cache in {}: {}: {}'.format(self.cfg_wx_cache_dir,
+                                                                                     type(e).__name__, str(e)))
+            return None
+
+    def install_http_cache(self):
+        """
+        Route the HTTP requests made by pyowm through a single cached session. The cache uses the ETag and
+        Last-Modified headers, so that a repeated request is revalidated with a conditional GET instead of downloading
+        the full response, and the session keeps its connection alive, so that a refresh does not open a new connection
+        each time
+        """
+
+        # never answer from the cache without revalidating: an unchanged observation served from the cache
+        # would make adapt_wx_refresh_interval() back off, while OpenWeatherMap may already have a new one
+        cache_name = os.path.join(self.cfg_wx_cache_dir, 'http')
+        try:
+            session = requests_cache.CachedSession(cache_name, backend='sqlite', cache_control=True, expire_after=0)
+        except Exception as e:
+            self.logger.warning('Cannot open the HTTP cache {}: {}: {}'.format(cache_name, type(e).__name__, str(e)))
+            session = requests.Session()
+
+        # only the weather thread talks to OpenWeatherMap, so a single pooled connection is enough
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        # pyowm calls requests.get(), which would otherwise set up (and tear down) a new session for every request
+        requests.get = session.get
+
+    def load_cached_weather(self, cache_key):
+        """
+        Restore the last weather observation from the on-disk cache, if there is one that has not expired yet.
+        The observation keeps its age, so it is only displayed until the next refresh is due
+
+        :param str cache_key: key of the observation location in the weather cache
+        """
+
+        if self.wx_cache is None:
+            return
+
+        try:
+            cached = self.wx_cache.get(cache_key)
+        except Exception as e:
+            # most likely an entry pickled by a different pyowm version: drop it and download the weather afresh
+            self.logger.warning('Dropping unreadable cached weather: {}: {}'.format(type(e).__name__, str(e)))
+            try:
+                self.wx_cache.delete(cache_key, retry=True)
+            except Exception:
+                pass
+            return
+
+        if cached is not None:
+            downloaded, wx = cached
+            self.set_weather(wx, time.monotonic() - (time.time() - downloaded), cache_key)
+            self.logger.info('Using cached weather from {}'.format(datetime.fromtimestamp(downloaded)))
+
+    def adapt_wx_refresh_interval(self, reference_time):
+        """
+        Adapt the weather refresh interval to how often the observation station actually reports:
+        back off if the last download returned the same observation as the previous one, otherwise
+        follow the time between the two observations
+
+        :param int reference_time: reference time of the latest observation (UNIX timestamp)
+        """
+
+        if self.wx_reference_time is not None:
+            if reference_time == self.wx_reference_time:
+                interval = self.wx_refresh_interval * 2
+            else:
+                interval = reference_time - self.wx_reference_time
+            self.wx_refresh_interval = min(max(interval, self.MIN_WX_INTERVAL), self.MAX_WX_INTERVAL)
+            self.logger.debug('Weather refresh interval: {}s'.format(self.wx_refresh_interval))
+
+        self.wx_reference_time = reference_time
 
     def generate_metar(self):
         """
-        Generate METAR code from the latest weather observation in self.wx
+        Generate METAR code from the latest weather observation in self.wx, as kept up to date by the weather thread
+
+        If the weather cannot be refreshed, the last observation keeps being displayed, but its parts are dropped
+        as they go stale: wind, visibility, weather, cloud and temperatures ttl_main seconds after the missed refresh,
+        humidity and pressure ttl_pressure seconds after it. The location and observation time are always shown.
 
         :return str: METAR code
         """
@@ -395,56 +791,96 @@ class StatusDaemon(Daemon):
             self.logger.warn('Error establishing connection to OpenWeatherMap')
             return
 
-        lat = self.configuration.getfloat('weather', 'latitude', fallback=None)
-        lon = self.configuration.getfloat('weather', 'longitude', fallback=None)
+        if self.cfg_latitude is not None and self.cfg_longitude is not None:
+            self.start_weather_updates()
 
-        if lat is not None and lon is not None:
-            self.get_weather(lat, lon)
-            if not self.wx:
-                self.logger.warn('Failed to download weather')
+            with self.wx_lock:
+                wx = self.wx
+                acquisition_ts = self.wx_acquisition_ts
+                refresh_interval = self.wx_refresh_interval
+                location = self.wx_location
+
+            if not wx:
+                self.logger.warn('No weather downloaded yet')
                 return ''
 
-            location = self.wx.get_location().get_name()
+            # the refresh interval adapts to the station and may well exceed the TTLs, so the parts only go stale
+            # once the observation is overdue, i.e. a refresh has failed
+            overdue = time.monotonic() - acquisition_ts - refresh_interval
+            main_fresh = overdue <= self.cfg_wx_ttl_main
+            pressure_fresh = overdue <= self.cfg_wx_ttl_pressure
+
+            # the observation only changes when new weather is downloaded, so reuse the METAR generated from it
+            metar_key = (acquisition_ts, main_fresh, pressure_fresh)
+            if self.metar is not None and self.metar_key == metar_key:
+                return self.metar
+
+            w = wx.get_weather()
 
-            obtime = self.wx.get_weather().get_reference_time()
+            obtime = w.get_reference_time()
             obtime = datetime.fromtimestamp(obtime).strftime('%d%H%M')
 
-            wind = self.wx.get_weather().get_wind()
-            wv = self.metar_wind(wind)
+            wv = visibility = weather = cloud = t_dp = rh = pressure = None
 
-            visibility = self.wx.get_weather().get_visibility_distance()
+            if main_fresh:
+                wind = w.get_wind()
+                wv = self.metar_wind(wind)
 
-            wxcode = self.wx.get_weather().get_weather_code()
-            weather = self.metar_weather(wxcode)
+                visibility = w.get_visibility_distance()
 
-            cloud = self.cloud(self.wx.get_weather().get_clouds())
+                wxcode = w.get_weather_code()
+                weather = self.metar_weather(wxcode)
 
-            temps = self.wx.get_weather().get_temperature('celsius')
-            temperature = self.metar_temperature(temps['temp'])
+                cloud = self.cloud(w.get_clouds())
 
-            humidity = self.wx.get_weather().get_humidity()
-            dewpoint = self.wx.get_weather().get_dewpoint() or self.metar_dewpoint(temps['temp'], humidity)
+                temps = w.get_temperature('celsius')
+                temperature = self.metar_temperature(temps['temp'])
 
-            rh = 'RH{}'.format(humidity)
-            t_dp = '{}/{}'.format(temperature, dewpoint)
+                humidity = w.get_humidity()
+                dewpoint = w.get_dewpoint() or self.metar_dewpoint(temps['temp'], humidity)
 
-            pressure = self.wx.get_weather().get_pressure()
-            pressure = self.metar_pressure(pressure)
+                t_dp = '{}/{}'.format(temperature, dewpoint)
 
-            wx = ['PsMETAR']
-            for item in [location.upper(), obtime, wv, visibility, weather, cloud, t_dp, rh, pressure]:
-                if item:
-                    wx.append(item)
+            if pressure_fresh:
+                rh = 'RH{}'.format(w.get_humidity())
 
-            wx = ' '.join(wx) + '='
+                pressure = w.get_pressure()
+                pressure = self.metar_pressure(pressure)
+
+            parts = (location, obtime, wv, visibility, weather, cloud, t_dp, rh, pressure)
+            wx = 'PsMETAR ' + ' '.join(str(item) for item in parts if item) + '='
             self.logger.info(wx)
 
+            self.metar = wx
+            self.metar_key = metar_key
             return wx
 
     #
     # Methods for displaying the information on the Scroll pHAT
     #
 
+    def ticks(self, count, interval):
+        """
+        Generate count display ticks, interval seconds apart. The ticks are scheduled on the monotonic clock,
+        so the time spent drawing a frame and the sleep jitter do not accumulate over the display.
+        The ticks stop early when the daemon is being stopped
+        :param int count: number of ticks
+        :param float interval: time in seconds between the ticks
+        :return generator[int]: tick number
+        """
+
+        monotonic = time.monotonic
+        sleep = self.sleep
+        next_tick = monotonic()
+        for tick in range(count):
+            if self.stopping:
+                return
+            yield tick
+            next_tick += interval
+            delay = next_tick - monotonic()
+            if delay > 0:
+                sleep(delay)
+
     def scroll_netinfo(self, interfaces, scroll_interval=0.1, display_count=1):
         """
         Display Network Information on the Scroll pHAT
@@ -453,9 +889,12 @@ class StatusDaemon(Daemon):
         :param int display_count: how many times to repeat a given information in the display cycle
         """
 
+        ip_addresses = self.get_ips()
         sysinfo = list()
         for interface in interfaces:
-            sysinfo.append('{}:{}'.format(interface[0].upper(), self.get_ip(interface)))
+            # an interface that is missing or has no IPv4 address is shown as such, without asking the kernel again
+            ipaddr = ip_addresses.get(interface) or '-'
+            sysinfo.append('{}:{}'.format(interface[0].upper(), ipaddr))
         self.scroll_text(sysinfo, scroll_interval, display_count)
 
     def scroll_cpuload(self, scroll_interval=0.1, display_count=1):
@@ -476,16 +915,23 @@ class StatusDaemon(Daemon):
         :param int display_count: how many times to repeat a given information in the display cycle
         """
 
+        get_time = self.get_time
+        write_string = scrollphat.write_string
+        scroll = scrollphat.scroll
+
         scrollphat.clear()
-        while display_count > 0:
-            current_time = self.get_time()
-            scrollphat.write_string(current_time, 11)
-            display_count -= 1
-            for _ in range(scrollphat.buffer_len()):
-                current_time = self.get_time()
-                scrollphat.write_string(current_time, 11)
-                scrollphat.scroll()
-                time.sleep(scroll_interval)
+        rendered_time = get_time()
+        write_string(rendered_time, 11)
+
+        # the rendered time always has the same width, so the buffer length does not change between re-renders
+        buf_len = scrollphat.buffer_len()
+        for _ in self.ticks(display_count * buf_len, scroll_interval):
+            # the time string only changes once a second, so only re-render the buffer when it does
+            current_time = get_time()
+            if current_time != rendered_time:
+                write_string(current_time, 11)
+                rendered_time = current_time
+            scroll()
 
     def scroll_weather(self, scroll_interval=0.1, display_count=1):
         """
@@ -512,89 +958,301 @@ class StatusDaemon(Daemon):
             text = ' | '.join(text)
 
         self.logger.debug('Scrolling: {}'.format(text))
-        while display_count > 0:
-            display_count -= 1
-            scrollphat.clear()
-            scrollphat.write_string(text, 11)
-            for i in range(0, scrollphat.buffer_len()):
-                scrollphat.scroll()
-                time.sleep(scroll_interval)
+
+        buf = self._bulk_render(text)
+        buf_len = len(buf) - self.SCROLLPHAT_WIDTH
+        width = self.SCROLLPHAT_WIDTH
+        push_frame = self._push_frame
+
+        # the buffer is rendered once and scrolled cyclically, so every repetition starts where the previous one ended
+        for i in self.ticks(display_count * buf_len, scroll_interval):
+            offset = (i + 1) % buf_len
+            push_frame(buf[offset:offset + width])
+
+        scrollphat.clear()
+
+    def _bulk_render(self, text):
+        """
+        Render the text into a Scroll pHAT column buffer in one go, using the scrollphat font table.
+        The layout matches scrollphat.write_string(text, 11): the text is preceded by one blank screen width.
+        The first screen width is appended again at the end, so that every scroll position is a contiguous slice,
+        and the rotation (if configured) is applied up front, so that frames can be pushed to the display as they are.
+        :param str text: text to render
+        :return bytes: rendered column buffer
+        """
+
+        return self._render_columns(text, self.flags.flip)
 
     @staticmethod
-    def scroll_cpugraph(duration=15, scroll_interval=0.2):
+    @lru_cache(maxsize=32)
+    def _render_columns(text, flip):
+        """
+        Render the text into a column buffer, as described in _bulk_render(). The buffers are cached, as the same
+        texts (network configuration, weather, load averages) keep coming back between their updates
+        :param str text: text to render
+        :param bool flip: whether the display is rotated by 180 degrees
+        :return bytes: rendered column buffer
+        """
+
+        width = StatusDaemon.SCROLLPHAT_WIDTH
+        font = scrollphat.controller.font
+        buf = bytearray(width)
+        for char in text:
+            glyph = font.get(ord(char))
+            if ord(char) == 0x20 or glyph is None:
+                buf += bytes(3)
+            else:
+                buf += bytes(glyph)
+                buf.append(0)
+
+        buf += buf[:width]
+
+        if flip:
+            buf = buf.translate(ROTATE5BITS)
+
+        return bytes(buf)
+
+    def _push_frame(self, frame):
+        """
+        Write a single frame directly to the Scroll pHAT in a single I2C block transaction
+        :param bytes frame: SCROLLPHAT_WIDTH columns to display
+        """
+
+        if self.flags.flip:
+            frame = frame[::-1]
+
+        controller = scrollphat.controller
+        try:
+            if self.i2c_fd is not None:
+                os.write(self.i2c_fd, bytes((self.SCROLLPHAT_UPDATE_REGISTER,)) + frame + b'\xff')
+            else:
+                controller.bus.write_i2c_block_data(controller.i2cConstants.I2C_ADDR,
+                                                    self.SCROLLPHAT_UPDATE_REGISTER,
+                                                    list(frame) + [0xff])
+        except IOError as e:
+            self.logger.debug('Error writing to the Scroll pHAT: {}'.format(str(e)))
+            self.i2c_errors += 1
+            if self.i2c_errors == self.SCROLLPHAT_MAX_ERRORS:
+                self.i2c_write_failing(e)
+        else:
+            self.i2c_errors = 0
+
+    def i2c_write_failing(self, error):
+        """
+        Handle repeated errors writing to the Scroll pHAT: if the frames go to the raw I2C device,
+        switch back to the smbus bindings used by scrollphat, otherwise report the problem
+        :param IOError error: the last write error
+        """
+
+        if self.i2c_fd is not None:
+            self.logger.warning('Repeated errors writing to the I2C device, falling back to smbus: {}'.format(
+                str(error)))
+            os.close(self.i2c_fd)
+            self.i2c_fd = None
+            self.i2c_errors = 0
+        else:
+            self.logger.warning('Repeated errors writing to the Scroll pHAT, please check the connections: {}'.format(
+                str(error)))
+
+    @staticmethod
+    def i2c_bus():
+        """
+        Get the number of the I2C bus the Scroll pHAT is attached to, chosen from the board revision the same way
+        the Pimoroni libraries do: bus 0 on the revision 1 Raspberry Pi, bus 1 on all the later boards
+        :return int: I2C bus number
+        """
+
+        try:
+            with open('/proc/cpuinfo') as f:
+                revision = next((line.split(':')[1].strip() for line in f if line.startswith('Revision')), '')
+            return 1 if int(revision, 16) >= 4 else 0
+        except (OSError, ValueError):
+            return 1
+
+    def open_i2c(self):
+        """
+        Open the I2C bus device of the Scroll pHAT for raw frame writes, so that each frame is sent
+        with a single write() syscall, without going through the smbus bindings
+        :return int or None: file descriptor addressing the Scroll pHAT; None if the device cannot be opened
+        """
+
+        device = self.SCROLLPHAT_I2C_DEVICE.format(self.i2c_bus())
+        try:
+            fd = os.open(device, os.O_RDWR)
+        except OSError as e:
+            self.logger.warning('Cannot open {}, falling back to smbus: {}'.format(device, str(e)))
+            return None
+
+        try:
+            fcntl.ioctl(fd, self.I2C_SLAVE, scrollphat.controller.i2cConstants.I2C_ADDR)
+        except OSError as e:
+            os.close(fd)
+            self.logger.warning('Cannot address the Scroll pHAT, falling back to smbus: {}'.format(str(e)))
+            return None
+
+        return fd
+
+    def scroll_cpugraph(self, duration=15, scroll_interval=0.2):
         """
         Plot the CPU load on the Scroll pHAT (graphically)
         :param int duration: how long to keep scrolling the CPU load graph for
         :param float scroll_interval: time in seconds to shift the scroll phat display by one pixel to the left
         """
 
+        # the graph is kept as ready to display column bytes, the same scrollphat.graph(values, 0, 25) would produce
+        bars = GRAPH_BARS.translate(ROTATE5BITS) if self.flags.flip else GRAPH_BARS
+        top = len(GRAPH_BARS) - 1
+        cpu_graph = bytearray(self.SCROLLPHAT_WIDTH)
+
+        cpu_percent = self.cpu_percent
+        push_frame = self._push_frame
+        bar = bars[0]
+        for _ in self.ticks(int(duration / scroll_interval), scroll_interval):
+            # on an idle system keep repeating the empty bar, without sampling /proc/stat
+            if bar != bars[0] or os.getloadavg()[0] >= self.IDLE_LOADAVG:
+                level = int(cpu_percent() / 5)
+                bar = bars[min(level, top)]
+            cpu_graph[:-1] = cpu_graph[1:]
+            cpu_graph[-1] = bar
+            push_frame(cpu_graph)
+
         scrollphat.clear()
-        cpu_graph_values = [0] * 11
-        for _ in range(int(duration / scroll_interval)):
-            cpu_graph_values.pop(0)
-            cpu_graph_values.append(psutil.cpu_percent())
-            scrollphat.graph(cpu_graph_values, 0, 25)
-            time.sleep(scroll_interval)
 
     #
     # Run loop
     #
 
+    def schedule_displays(self):
+        """
+        Queue all the enabled displays on the scheduler. On startup they are shown in the order listed here,
+        afterwards each display is repeated on its own period
+        """
+
+        flags = self.flags
+        interfaces = ['eth0', 'wlan0']
+        displays = [
+            (flags.time, self.cfg_time_period,
+             partial(self.scroll_time, display_count=self.cfg_time_display_count,
+                     scroll_interval=self.cfg_time_interval)),
+            (flags.network, self.cfg_network_period,
+             partial(self.scroll_netinfo, interfaces, display_count=self.cfg_network_display_count,
+                     scroll_interval=self.cfg_network_interval)),
+            (flags.cpuload, self.cfg_cpuload_period,
+             partial(self.scroll_cpuload, display_count=self.cfg_cpuload_display_count,
+                     scroll_interval=self.cfg_cpuload_interval)),
+            (flags.cpugraph, self.cfg_cpugraph_period,
+             partial(self.scroll_cpugraph, duration=self.cfg_cpugraph_duration,
+                     scroll_interval=self.cfg_cpugraph_interval)),
+            (flags.weather, self.cfg_weather_period,
+             partial(self.scroll_weather, display_count=self.cfg_weather_display_count,
+                     scroll_interval=self.cfg_weather_interval)),
+        ]
+
+        for priority, (enabled, period, display) in enumerate(displays):
+            if enabled:
+                self.scheduler.enter(0, priority, self.run_display, (priority, period, display))
+
+    def run_display(self, priority, period, display):
+        """
+        Show a display on the Scroll pHAT and schedule it to be shown again after its period
+        :param int priority: scheduler priority of the display, used to order displays which are due at the same time
+        :param float or None period: time in seconds between the displays; None to follow the weather refresh interval
+        :param callable display: the display method to run
+        """
+
+        if self.config_reloaded:
+            return
+
+        display()
+
+        delay = period
+        if delay is None:
+            # until the first observation arrives, try again as soon as the weather thread retries the download
+            delay = self.wx_refresh_interval if self.wx is not None else self.WX_RETRY_INTERVAL
+        self.scheduler.enter(delay, priority, self.run_display, (priority, period, display))
+
+    def open_wakeup_fd(self):
+        """
+        Have the signals delivered to the daemon written to a pipe, so that a sleep waiting on the pipe
+        is cut short by a signal, instead of being resumed after the signal handler returns
+        :return int or None: read end of the pipe; None if the pipe cannot be set up
+        """
+
+        try:
+            read_fd, write_fd = os.pipe()
+            os.set_blocking(read_fd, False)
+            os.set_blocking(write_fd, False)
+            signal.set_wakeup_fd(write_fd)
+        except (OSError, ValueError) as e:
+            self.logger.warning('Cannot set up the signal wakeup pipe: {}: {}'.format(type(e).__name__, str(e)))
+            return None
+
+        return read_fd
+
+    def sleep(self, delay):
+        """
+        Sleep for the given time, or until a signal is delivered to the daemon
+        :param float delay: time in seconds to sleep for
+        """
+
+        if self.wakeup_fd is None:
+            time.sleep(delay)
+            return
+
+        readable, _, _ = select.select([self.wakeup_fd], [], [], delay)
+        if readable:
+            try:
+                os.read(self.wakeup_fd, 512)
+            except BlockingIOError:
+                pass
+
+    def scheduler_sleep(self, delay):
+        """
+        Wait for the next display to become due. If the configuration gets reloaded in the meantime,
+        drop all the queued displays, so that they can be scheduled again using the new configuration
+        :param float delay: time in seconds until the next display is due
+        """
+
+        # without the wakeup pipe, a sleep is resumed after a SIGHUP, so only sleep a second at a time
+        self.sleep(delay if self.wakeup_fd is not None else min(delay, 1.0))
+        if self.config_reloaded:
+            for event in self.scheduler.queue:
+                self.scheduler.cancel(event)
+
     def run(self):
         """
         Main program run loop
         """
 
         scrollphat.set_brightness(self.scrollphat_brightness)
-        rotate = self.configuration.getboolean('scrollphat', 'flip', fallback=False)
-        scrollphat.set_rotate(rotate)
+        scrollphat.set_rotate(self.flags.flip)
+        self.wakeup_fd = self.open_wakeup_fd()
+        signal.signal(signal.SIGHUP, self.sighup_handler)
+        self.i2c_fd = self.open_i2c()
+        self.wx_cache = self.open_wx_cache()
+
+        # start downloading the weather in the background, so that it is ready by the time it is displayed
+        if self.flags.weather and self.owm and self.cfg_latitude is not None and self.cfg_longitude is not None:
+            self.start_weather_updates()
 
-        loop_runs = 0
         while True:
             try:
-                if self.configuration.getboolean('scrollphat', 'time_display', fallback=False):
-                    interval = self.configuration.getfloat('scrollphat', 'time_interval',
-                                                           fallback=self.DEFAULT_INTERVAL)
-                    display_count = self.configuration.getint('scrollphat', 'time_display_count',
-                                                              fallback=self.DEFAULT_DISPLAY_COUNT)
-                    self.scroll_time(display_count=display_count, scroll_interval=interval)
-
-                if self.configuration.getboolean('scrollphat', 'network_display', fallback=False):
-                    if divmod(loop_runs, 10)[1] == 0:
-                        interfaces = ['eth0', 'wlan0']
-                        interval = self.configuration.getfloat('scrollphat', 'network_interval',
-                                                               fallback=self.DEFAULT_INTERVAL)
-                        display_count = self.configuration.getint('scrollphat', 'network_display_count',
-                                                                  fallback=self.DEFAULT_DISPLAY_COUNT)
-                        self.scroll_netinfo(interfaces, scroll_interval=interval, display_count=display_count)
-
-                if self.configuration.getboolean('scrollphat', 'cpuload_display', fallback=False):
-                    display_count = self.configuration.getint('scrollphat', 'cpuload_display_count',
-                                                              fallback=self.DEFAULT_DISPLAY_COUNT)
-                    interval = self.configuration.getint('scrollphat', 'cpuload_interval',
-                                                         fallback=self.DEFAULT_INTERVAL)
-                    self.scroll_cpuload(display_count=display_count, scroll_interval=interval)
-
-                if self.configuration.getboolean('scrollphat', 'cpugraph_display', fallback=False):
-                    duration = self.configuration.getint('scrollphat', 'cpugraph_duration', fallback=15)
-                    interval = self.configuration.getfloat('scrollphat', 'cpugraph_interval',
-                                                           fallback=self.DEFAULT_INTERVAL)
-                    self.scroll_cpugraph(duration=duration, scroll_interval=interval)
-
-                if self.configuration.getboolean('scrollphat', 'weather_display', fallback=False):
-                    display_count = self.configuration.getint('scrollphat', 'weather_display_count',
-                                                              fallback=self.DEFAULT_DISPLAY_COUNT)
-                    interval = self.configuration.getfloat('scrollphat', 'weather_interval',
-                                                           fallback=self.DEFAULT_INTERVAL)
-                    self.scroll_weather(scroll_interval=interval, display_count=display_count)
-
-                loop_runs += 1
+                self.config_reloaded = False
+                if self.flags.network:
+                    self.watch_ip_addresses()
+                self.schedule_displays()
+                self.scheduler.run()
+
+                if not self.config_reloaded:
+                    self.logger.warning('No display enabled, waiting for the configuration to be reloaded')
+                    signal.pause()
 
             except KeyboardInterrupt:
                 self.logger.info('Exiting')
                 scrollphat.clear()
                 raise SystemExit(0)
 
+
 def main():
     """
     Main entry point into the application
@@ -5,14 +5,27 @@ To run:
 nosetests -s test_piserverstatusd.py
 """
 
+import math
+import os
+import shutil
+import tempfile
+import time
 import unittest
+from unittest import mock
 
 import piserverstatusd
 
 class PiServerStatusdTestCase(unittest.TestCase):
 
-    def setUp(self):
-        self.daemon = piserverstatusd.StatusDaemon('/tmp/test_piserverstatusd.pid')
+    @classmethod
+    def setUpClass(cls):
+        # the daemon never gets started, but keep its pidfile path private to this run all the same
+        cls.tmpdir = tempfile.mkdtemp(prefix='test_piserverstatusd')
+        cls.daemon = piserverstatusd.StatusDaemon(os.path.join(cls.tmpdir, 'piserverstatusd.pid'))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir, ignore_errors=True)
 
     def test_mps_to_kt(self):
         speed = 100
@@ -21,6 +34,7 @@ class PiServerStatusdTestCase(unittest.TestCase):
     def test_cloud(self):
         self.assertEqual('', self.daemon.cloud(0))
         self.assertEqual('FEW', self.daemon.cloud(12))
+        self.assertEqual('FEW', self.daemon.cloud(25))
         self.assertEqual('SCT', self.daemon.cloud(30))
         self.assertEqual('BKN', self.daemon.cloud(70))
         self.assertEqual('OVC', self.daemon.cloud(99))
@@ -37,7 +51,8 @@ class PiServerStatusdTestCase(unittest.TestCase):
         ]
 
         for vals in test_values:
-            self.assertEqual(vals['dp'], self.daemon.metar_dewpoint(vals['t'], vals['rh']))
+            with self.subTest(case=vals):
+                self.assertEqual(vals['dp'], self.daemon.metar_dewpoint(vals['t'], vals['rh']))
 
     def test_metar_temperature(self):
         test_values = [
@@ -45,7 +60,8 @@ class PiServerStatusdTestCase(unittest.TestCase):
         ]
 
         for vals in test_values:
-            self.assertEqual(vals[1], self.daemon.metar_temperature(vals[0]))
+            with self.subTest(case=vals):
+                self.assertEqual(vals[1], self.daemon.metar_temperature(vals[0]))
 
     def test_metar_wind(self):
         test_values = [
@@ -55,7 +71,8 @@ class PiServerStatusdTestCase(unittest.TestCase):
         ]
 
         for vals in test_values:
-            self.assertEqual(vals['result'], self.daemon.metar_wind(vals))
+            with self.subTest(case=vals):
+                self.assertEqual(vals['result'], self.daemon.metar_wind(vals))
 
     def test_metar_pressure(self):
         test_values = [
@@ -66,10 +83,143 @@ class PiServerStatusdTestCase(unittest.TestCase):
         ]
 
         for vals in test_values:
-            self.assertEqual(vals['result'], self.daemon.metar_pressure(vals))
+            with self.subTest(case=vals):
+                self.assertEqual(vals['result'], self.daemon.metar_pressure(vals))
 
     def test_metar_weather(self):
         self.assertEqual('SQ TSRA', self.daemon.metar_weather([771, 201]))
         self.assertEqual('', self.daemon.metar_weather(800))
         self.assertEqual('TSRA', self.daemon.metar_weather([201, 800]))
 
+    def test_bulk_render(self):
+        buf = self.daemon._bulk_render('A B')
+        self.assertEqual(bytearray(11) + bytearray([30, 5, 30, 0, 0, 0, 0, 31, 21, 10, 0]) + bytearray(11), buf)
+
+    def test_scroll_text_frames(self):
+        daemon = piserverstatusd.StatusDaemon(os.path.join(self.tmpdir, 'text.pid'))
+        scrollphat = piserverstatusd.scrollphat
+        text = 'L:0.5 x'
+
+        for flip in (False, True):
+            with self.subTest(flip=flip):
+                # what the library would have shown: write_string(text, 11), then one scroll() per tick
+                library = scrollphat.IS31FL3730(mock.Mock(), scrollphat.font)
+                library.set_rotate(flip)
+                library.write_string(text, 11)
+                expected = []
+                for _ in range(2 * library.buffer_len()):
+                    library.scroll()
+                    expected.append(library.window)
+
+                daemon.flags.flip = flip
+                daemon.ticks = lambda count, interval: range(count)
+                bus = mock.Mock()
+                with mock.patch.object(scrollphat.controller, 'bus', bus), mock.patch.object(scrollphat, 'clear'):
+                    daemon.scroll_text(text, display_count=2)
+
+                self.assertEqual(expected, [call[0][2] for call in bus.write_i2c_block_data.call_args_list])
+
+    def test_dewpoint_log10_identity(self):
+        for t, rh in [(40, 50), (-10, 66), (25, 100), (10, 50), (0.5, 1)]:
+            with self.subTest(t=t, rh=rh):
+                pws = 6.116441 * pow(10, 7.591386 * t / (t + 240.7263))
+                expected = 240.7263 / (7.591386 / math.log10(pws * rh / 100.0 / 6.116441) - 1)
+                self.assertAlmostEqual(expected, self.daemon.dewpoint(t, rh), 9)
+
+    def test_adapt_wx_refresh_interval(self):
+        self.daemon.wx_reference_time = None
+        self.daemon.wx_refresh_interval = self.daemon.DEFAULT_WX_INTERVAL
+        self.daemon.adapt_wx_refresh_interval(1000)
+        self.assertEqual(300, self.daemon.wx_refresh_interval)
+        self.daemon.adapt_wx_refresh_interval(1000)
+        self.assertEqual(600, self.daemon.wx_refresh_interval)
+        self.daemon.adapt_wx_refresh_interval(1900)
+        self.assertEqual(900, self.daemon.wx_refresh_interval)
+        self.daemon.adapt_wx_refresh_interval(1960)
+        self.assertEqual(120, self.daemon.wx_refresh_interval)
+        self.daemon.adapt_wx_refresh_interval(9000)
+        self.assertEqual(1800, self.daemon.wx_refresh_interval)
+
+    def test_get_time(self):
+        self.assertRegex(self.daemon.get_time(), r'^\d\d:\d\d:\d\d$')
+
+    def test_get_time_formats_once_per_second(self):
+        daemon = piserverstatusd.StatusDaemon(os.path.join(self.tmpdir, 'time.pid'))
+        with mock.patch('time.time', side_effect=[1000.1, 1000.9, 1001.0]), \
+                mock.patch('time.strftime', side_effect=['00:16:40', '00:16:41']) as strftime:
+            self.assertEqual('00:16:40', daemon.get_time())
+            self.assertEqual('00:16:40', daemon.get_time())
+            self.assertEqual(1, strftime.call_count)
+            self.assertEqual('00:16:41', daemon.get_time())
+            self.assertEqual(2, strftime.call_count)
+            strftime.assert_called_with('%H:%M:%S', time.localtime(1001))
+
+    def test_generate_metar_staleness(self):
+        daemon = piserverstatusd.StatusDaemon(os.path.join(self.tmpdir, 'metar.pid'))
+        daemon.configure()
+        daemon.owm = mock.Mock()
+        daemon.cfg_latitude, daemon.cfg_longitude = 53.35, -6.26
+        daemon.start_weather_updates = mock.Mock()
+
+        w = mock.Mock()
+        w.get_reference_time.return_value = 1500000000
+        w.get_wind.return_value = {'speed': 20, 'deg': 270}
+        w.get_visibility_distance.return_value = 9999
+        w.get_weather_code.return_value = 500
+        w.get_clouds.return_value = 40
+        w.get_temperature.return_value = {'temp': 12}
+        w.get_humidity.return_value = 80
+        w.get_dewpoint.return_value = None
+        w.get_pressure.return_value = {'press': 1013, 'sea_level': 1015}
+        daemon.wx = mock.Mock()
+        daemon.wx.get_weather.return_value = w
+        daemon.wx_location = 'DUBLIN'
+        daemon.wx_refresh_interval = daemon.MAX_WX_INTERVAL
+        obtime = piserverstatusd.datetime.fromtimestamp(1500000000).strftime('%d%H%M')
+
+        test_values = [
+            (1700, 'PsMETAR DUBLIN {} 27010KT 9999 -RA SCT 12/09 RH80 Q1015 QFE1013='.format(obtime)),
+            (1800 + 1000, 'PsMETAR DUBLIN {} RH80 Q1015 QFE1013='.format(obtime)),
+            (1800 + 2000, 'PsMETAR DUBLIN {}='.format(obtime)),
+        ]
+
+        for age, metar in test_values:
+            with self.subTest(age=age):
+                daemon.wx_acquisition_ts = time.monotonic() - age
+                self.assertEqual(metar, daemon.generate_metar())
+
+    def test_cpu_percent(self):
+        daemon = piserverstatusd.StatusDaemon(os.path.join(self.tmpdir, 'cpu.pid'))
+        samples = [
+            b'cpu  100 0 100 700 100 0 0 0 0 0\n',    # idle 800 of 1000
+            b'cpu  150 0 150 1000 200 0 0 0 0 0\n',   # idle +400 of +500
+            b'cpu  150 0 150 1000 200 0 0 0 0 0\n',   # no ticks elapsed
+        ]
+
+        for line, percent in zip(samples, [20.0, 20.0, 0.0]):
+            with self.subTest(line=line), mock.patch('builtins.open', mock.mock_open(read_data=line)):
+                self.assertAlmostEqual(percent, daemon.cpu_percent())
+
+    def test_scroll_cpugraph_columns(self):
+        daemon = piserverstatusd.StatusDaemon(os.path.join(self.tmpdir, 'graph.pid'))
+        values = [0, 4.9, 5, 10, 15, 20, 24.9, 25, 60, 100, 3, 50]
+
+        def graph_column(value, flip):
+            # what scrollphat.graph(values, 0, 25) sets for a single value, rotated like the IS31FL3730 driver does
+            column = [0, 16, 24, 28, 30, 31][int(min(max(value / 25 * 5, 0), 5))]
+            return int('{:05b}'.format(column)[::-1], 2) if flip else column
+
+        for flip in (False, True):
+            with self.subTest(flip=flip):
+                frames = []
+                daemon.flags.flip = flip
+                daemon.cpu_percent = mock.Mock(side_effect=values)
+                daemon.ticks = lambda count, interval: range(count)
+                daemon._push_frame = lambda frame: frames.append(bytes(frame))
+                with mock.patch('os.getloadavg', return_value=(1.0, 1.0, 1.0)), \
+                        mock.patch.object(piserverstatusd.scrollphat, 'clear'):
+                    daemon.scroll_cpugraph(duration=len(values), scroll_interval=1)
+
+                columns = [0] * daemon.SCROLLPHAT_WIDTH + [graph_column(value, flip) for value in values]
+                expected = [bytes(columns[i + 1:i + 1 + daemon.SCROLLPHAT_WIDTH]) for i in range(len(values))]
+                self.assertEqual(expected, frames)